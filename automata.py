@@ -1,5 +1,11 @@
+import asyncio
+from array import array
+from bisect import bisect_left, bisect_right
+from codecs import getincrementaldecoder
+from concurrent.futures import Executor
+from functools import lru_cache
 from itertools import combinations
-from typing import Set, Dict
+from typing import Set, Dict, Callable, Tuple, AsyncIterable, AsyncIterator, Optional, Union
 
 
 def get_power_set(s: Set):
@@ -183,7 +189,7 @@ class NfaState(State):
         if symbol not in self.alphabet:
             raise ValueError('Symbol is not part of the given alphabet.')
 
-        self.transitions[symbol].append(state)
+        self.transitions.setdefault(symbol, []).append(state)
         return symbol
 
     def convert_to_dfa_state(self):
@@ -199,26 +205,36 @@ class NfaState(State):
         states = set()
         states.add(self)
 
-        state_queue = [] if self.transitions[None] is None else [x for x in self.transitions[None]]
+        state_queue = [x for x in self.get_transitions(None)]
 
         while len(state_queue) > 0:
 
             next_state = state_queue.pop(0)
             states.add(next_state)
 
-            for state in next_state.transitions[None]:
+            for state in next_state.get_transitions(None):
                 state_queue.append(state)
 
         return tuple(sorted([x.index for x in states]))
 
+    def get_transitions(self, symbol) -> list:
+        """
+        Args:
+            symbol (str): Symbol on which the transitions occur.
+
+        Returns:
+            list: States where the state instance transitions when reading the symbol parameter.
+        """
+        return self.transitions.get(symbol, [])
+
     def _get_empty_transitions(self):
         """
-        Creates empty transitions for every symbol in the state's alphabet.
+        Creates sparse transitions, holding only the symbols on which the state has at least one transition.
 
         Returns:
-            dict: symbol:None pairs for each symbol in the state's alphabet.
+            dict: Empty dictionary of symbol:states pairs.
         """
-        return {x: [] for x in self.alphabet.symbols}
+        return {}
 
     def __repr__(self):
         """
@@ -230,11 +246,86 @@ class NfaState(State):
         symbols = sorted(self.alphabet.symbols, key=lambda x: '' if x is None else x)
 
         for i in symbols:
-            value += '{} -> {}\n'.format(i, [x.index for x in self.transitions[i]])
+            value += '{} -> {}\n'.format(i, [x.index for x in self.get_transitions(i)])
 
         return value
 
 
+class SparseTransitions(object):
+    """
+    Compressed sparse row representation of the transitions of a whole NFA automata. Transitions of each state are
+    stored as consecutive (symbol, destination) pairs sorted by symbol, so memory scales with the number of states
+    and transitions instead of the number of states times the alphabet size.
+
+    Attributes:
+        symbols (tuple): Sorted alphabet symbols, where the position of a symbol is used as its id.
+        offsets (array): Start position of each state's transitions, the state index being the array index.
+        edge_symbols (array): Symbol id of every transition.
+        edge_targets (array): Destination state index of every transition.
+    """
+
+    def __init__(self, states: Dict, symbols: Set):
+        """
+        Args:
+            states (Dict): Dictionary of NFA states given in index:state pairs.
+            symbols (Set): Alphabet symbols on which the transitions are created.
+        """
+
+        self.symbols = tuple(sorted(symbols, key=lambda x: '' if x is None else x))
+        self._symbol_ids = {symbol: index for index, symbol in enumerate(self.symbols)}
+
+        self.offsets = array('l', [0])
+        self.edge_symbols = array('l')
+        self.edge_targets = array('l')
+
+        for i in range(max(states) + 1 if len(states) > 0 else 0):
+
+            if i in states:
+                for symbol in sorted(states[i].transitions, key=lambda x: self._symbol_ids[x]):
+                    for state in states[i].transitions[symbol]:
+                        self.edge_symbols.append(self._symbol_ids[symbol])
+                        self.edge_targets.append(state.index)
+
+            self.offsets.append(len(self.edge_targets))
+
+    def get_successors(self, index: int, symbol) -> list:
+        """
+        Finds the successors with a binary search over the state's transitions, bounded by the state's number of
+        transitions. Use the per state transitions of the NFA for a direct lookup.
+
+        Args:
+            index (int): Index of the state from which transitions start.
+            symbol (str): Symbol on which the transitions occur.
+
+        Returns:
+            list: Indexes of the states where the state transitions when reading the symbol parameter.
+
+        Raises:
+            ValueError: If symbol is not part of the alphabet or if the state index is out of bounds.
+        """
+
+        if symbol not in self._symbol_ids:
+            raise ValueError('Symbol is not a part of the alphabet.')
+
+        if not 0 <= index < len(self.offsets) - 1:
+            raise ValueError('State index out of bounds.')
+
+        symbol_id = self._symbol_ids[symbol]
+        start, end = self.offsets[index], self.offsets[index+1]
+
+        first = bisect_left(self.edge_symbols, symbol_id, start, end)
+        last = bisect_right(self.edge_symbols, symbol_id, first, end)
+
+        return self.edge_targets[first:last].tolist()
+
+    def __len__(self):
+        """
+        Returns:
+            int: Number of stored transitions.
+        """
+        return len(self.edge_targets)
+
+
 class Dfa(object):
     """
         Class representation of the formal defined of a DFA automata. May be considered as a graph.
@@ -327,7 +418,25 @@ class Dfa(object):
             ValueError: If symbol is not in the DFA's alphabet.
         """
 
-        next_state = self.get_start_state()
+        return self._advance(self.get_start_state(), string).index in self.accept_indices
+
+    def _advance(self, state: 'State', string: str) -> 'State':
+        """
+        Follows the DFA's transitions from the state parameter while reading the string parameter. Used to run the
+        DFA incrementally over consecutive parts of an input.
+
+        Args:
+            state (State): DFA state from which reading starts.
+            string (str): String formed on the DFA's alphabet.
+
+        Returns:
+            State: DFA state reached after reading the whole string.
+
+        Raises:
+            ValueError: If symbol is not in the DFA's alphabet.
+        """
+
+        next_state = state
 
         for symbol in string:
 
@@ -336,7 +445,7 @@ class Dfa(object):
 
             next_state = next_state.transitions[symbol]
 
-        return next_state.index in self.accept_indices
+        return next_state
 
     def remove_redundant_states(self):
         """
@@ -413,25 +522,22 @@ class Nfa(Dfa):
             if index == len(string) and current_state_index in self.accept_indices:
                 return True
 
-            elif index == len(string):
-
-                for state in current_state.transitions[None]:
-                    state_queue.append((index, state.index))
-
-                continue
-
-            for symbol in current_state.transitions:
-
-                if symbol is None:
-                    for state in current_state.transitions[symbol]:
-                        state_queue.append((index, state.index))
+            for state in current_state.get_transitions(None):
+                state_queue.append((index, state.index))
 
-                elif symbol == string[index]:
-                    for state in current_state.transitions[symbol]:
-                        state_queue.append((index+1, state.index))
+            if index < len(string):
+                for state in current_state.get_transitions(string[index]):
+                    state_queue.append((index+1, state.index))
 
         return False
 
+    def get_sparse_transitions(self) -> 'SparseTransitions':
+        """
+        Returns:
+            SparseTransitions: Compressed sparse row representation of the NFA's transitions.
+        """
+        return SparseTransitions(self.states, self.alphabet.symbols)
+
     def convert_to_dfa(self):
         """
         Converts the NFA automata instance into an equivalent DFA automata instance. This function removes
@@ -463,9 +569,246 @@ class Nfa(Dfa):
 
                 for index in s:
 
-                    for state in self.states[index].transitions[symbol]:
+                    for state in self.states[index].get_transitions(symbol):
                         next_state = next_state.union(self.states[state.index].convert_to_dfa_state())
 
                 d.add_transition(states[s], states[tuple(sorted(next_state))], symbol)
 
         return d
+
+
+def compile_dfa(dfa: 'Dfa') -> Callable[[str], bool]:
+    """
+    Compiles a DFA instance into a specialized Python matcher function. Only the states reachable from the start
+    state are compiled, symbols are pre-mapped onto their destination states and the matcher exits early once it
+    enters a state from which no accepting state can be reached. Matchers are cached by the automaton's structure, so
+    compiling an equal automaton again reuses the already created function.
+
+    Args:
+        dfa (Dfa): DFA instance which is compiled. Every reachable state must define a transition for every symbol.
+
+    Returns:
+        Callable: Function taking a string and returning the same result as the accepts method of the DFA instance.
+
+    Raises:
+        ValueError: If the parameter is a NFA instance or if any reachable state has an undefined transition.
+    """
+
+    if isinstance(dfa, Nfa):
+        raise ValueError('Only DFA instances can be compiled.')
+
+    return _compile_dfa_key(_get_dfa_key(dfa))
+
+
+def _get_dfa_key(dfa: 'Dfa') -> Tuple:
+    """
+    Creates a hashable description of the DFA's reachable states, in which states are renumbered in the BFS order
+    starting from the start state. Equal automata produce equal keys.
+
+    Args:
+        dfa (Dfa): DFA instance which is described.
+
+    Returns:
+        tuple: Tuple of sorted alphabet symbols, accepting state indexes and per state transition tuples.
+
+    Raises:
+        ValueError: If any reachable state has an undefined transition.
+    """
+
+    symbols = tuple(sorted(x for x in dfa.alphabet.symbols if x is not None))
+    indices = {dfa.start: 0}
+    queue = [dfa.get_start_state()]
+    transitions = []
+
+    while len(queue) > 0:
+
+        state = queue.pop(0)
+        row = []
+
+        for symbol in symbols:
+
+            next_state = state.transitions[symbol]
+
+            if next_state is None:
+                raise ValueError('Transition is not defined for every symbol of the alphabet.')
+
+            if next_state.index not in indices:
+                indices[next_state.index] = len(indices)
+                queue.append(next_state)
+
+            row.append(indices[next_state.index])
+
+        transitions.append(tuple(row))
+
+    accept_indices = tuple(sorted(indices[x] for x in dfa.accept_indices if x in indices))
+
+    return symbols, accept_indices, tuple(transitions)
+
+
+def _get_dead_indices(accept_indices: Tuple, transitions: Tuple) -> Set:
+    """
+    Finds states from which no accepting state can be reached.
+
+    Args:
+        accept_indices (tuple): Accepting state indexes.
+        transitions (tuple): Per state tuples of destination state indexes.
+
+    Returns:
+        set: Set of dead state indexes.
+    """
+
+    predecessors = {x: set() for x in range(len(transitions))}
+
+    for source, row in enumerate(transitions):
+        for destination in row:
+            predecessors[destination].add(source)
+
+    alive = set(accept_indices)
+    queue = list(accept_indices)
+
+    while len(queue) > 0:
+
+        state = queue.pop(0)
+
+        for source in predecessors[state]:
+            if source not in alive:
+                alive.add(source)
+                queue.append(source)
+
+    return {x for x in range(len(transitions)) if x not in alive}
+
+
+@lru_cache(maxsize=128)
+def _compile_dfa_key(key: Tuple) -> Callable[[str], bool]:
+    """
+    Creates a matcher function for the DFA described by the key parameter. Every state is represented by a dictionary
+    mapping symbols directly onto the dictionaries of the destination states, so reading a symbol is a single lookup.
+    Dead states are represented by one empty dictionary, so entering it exits the loop without any per symbol check.
+
+    Args:
+        key (tuple): DFA description created by the _get_dfa_key function.
+
+    Returns:
+        Callable: Matcher function.
+    """
+
+    symbols, accept_indices, transitions = key
+    dead_indices = _get_dead_indices(accept_indices, transitions)
+
+    dead = {}
+    rows = [dead if x in dead_indices else {} for x in range(len(transitions))]
+
+    for index, row in enumerate(transitions):
+        if index not in dead_indices:
+            rows[index].update({symbol: rows[destination] for symbol, destination in zip(symbols, row)})
+
+    start = rows[0]
+    accept_ids = frozenset(id(rows[x]) for x in accept_indices)
+    symbol_set = frozenset(symbols)
+
+    def match(string: str) -> bool:
+
+        state = start
+        string = iter(string)
+        symbol = None
+
+        try:
+            for symbol in string:
+                state = state[symbol]
+
+        except KeyError:
+
+            if state is not dead or symbol not in symbol_set or not symbol_set.issuperset(string):
+                raise ValueError('Symbol is not a part of the alphabet.') from None
+
+            return False
+
+        return id(state) in accept_ids
+
+    return match
+
+
+async def accepts_stream(dfa: 'Dfa', stream: Union[asyncio.StreamReader, AsyncIterable], chunk_size: int = 65536,
+                         offload_size: Optional[int] = None, executor: Optional[Executor] = None,
+                         encoding: str = 'utf-8') -> bool:
+    """
+    Checks whether the DFA instance accepts the input read from an asyncio stream, advancing the DFA one chunk at a
+    time and yielding control to the event loop between chunks, so large inputs do not block the event loop.
+
+    Args:
+        dfa (Dfa): DFA instance used to check the input.
+        stream (Union[StreamReader, AsyncIterable]): Stream reader or asynchronous iterable of str or bytes chunks.
+        chunk_size (int): Maximal number of symbols read from the stream or processed between two yields.
+        offload_size (Optional[int]): Chunks with at least this many symbols are processed in the executor instead
+            of the event loop thread. Chunks are never offloaded if None.
+        executor (Optional[Executor]): Executor used for offloaded chunks, the event loop's default if None.
+        encoding (str): Encoding used to decode bytes chunks.
+
+    Returns:
+        bool: True if the DFA accepts the whole input, False otherwise.
+
+    Raises:
+        ValueError: If the parameter is a NFA instance, if chunk size is not positive or if symbol is not in the
+        DFA's alphabet.
+    """
+
+    if isinstance(dfa, Nfa):
+        raise ValueError('Only DFA instances can be streamed.')
+
+    if chunk_size <= 0:
+        raise ValueError('Chunk size must be positive.')
+
+    loop = asyncio.get_running_loop()
+    decoder = None
+    state = dfa.get_start_state()
+
+    async for chunk in _get_stream_chunks(stream, chunk_size):
+
+        if isinstance(chunk, (bytes, bytearray)):
+
+            if decoder is None:
+                decoder = getincrementaldecoder(encoding)()
+
+            chunk = decoder.decode(chunk)
+
+        if offload_size is not None and len(chunk) >= offload_size:
+            state = await loop.run_in_executor(executor, dfa._advance, state, chunk)
+            continue
+
+        for i in range(0, len(chunk), chunk_size):
+            state = dfa._advance(state, chunk[i:i+chunk_size])
+            await asyncio.sleep(0)
+
+    if decoder is not None:
+        state = dfa._advance(state, decoder.decode(b'', final=True))
+
+    return state.index in dfa.accept_indices
+
+
+async def _get_stream_chunks(stream: Union[asyncio.StreamReader, AsyncIterable], chunk_size: int) -> AsyncIterator:
+    """
+    Iterates over stream chunks. Stream readers are read in chunks of at most chunk size bytes instead of lines.
+
+    Args:
+        stream (Union[StreamReader, AsyncIterable]): Stream reader or asynchronous iterable of chunks.
+        chunk_size (int): Maximal number of bytes read from a stream reader at once.
+
+    Returns:
+        AsyncIterator: Asynchronous iterator of the stream's chunks.
+    """
+
+    if isinstance(stream, asyncio.StreamReader):
+
+        while True:
+
+            chunk = await stream.read(chunk_size)
+
+            if not chunk:
+                return
+
+            yield chunk
+
+    else:
+
+        async for chunk in stream:
+            yield chunk
@@ -0,0 +1,31 @@
+from random import choice
+from timeit import timeit
+
+from automata import Alphabet
+from automata import Dfa
+from automata import compile_dfa
+
+al = Alphabet({'0', '1'})
+
+d = Dfa(4, al, 0, 3)
+d.add_transition(0, 0, '1')
+d.add_transition(0, 1, '0')
+d.add_transition(1, 1, '0')
+d.add_transition(1, 2, '1')
+d.add_transition(2, 0, '1')
+d.add_transition(2, 3, '0')
+d.add_transition(3, 3, '0')
+d.add_transition(3, 3, '1')
+
+# substring 010 is never present, so neither matcher exits early
+s = ''.join(choice(['1', '11', '0011']) for _ in range(100000))
+match = compile_dfa(d)
+
+assert d.accepts(s) == match(s)
+
+interpreted = timeit(lambda: d.accepts(s), number=10)
+compiled = timeit(lambda: match(s), number=10)
+
+print('Dfa.accepts: {:.4f}s'.format(interpreted))
+print('compile_dfa: {:.4f}s'.format(compiled))
+print('speedup: {:.2f}x'.format(interpreted / compiled))
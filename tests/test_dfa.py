@@ -1,10 +1,15 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from random import randint
+from unittest import IsolatedAsyncioTestCase
 from unittest import TestCase
 from unittest import main
 
 from automata import Alphabet
 from automata import Dfa
 from automata import Nfa
+from automata import accepts_stream
+from automata import compile_dfa
 
 
 def get_random_string() -> str:
@@ -22,6 +27,38 @@ def get_alphabet() -> 'Alphabet':
     return Alphabet({'0', '1'})
 
 
+def get_substr_010_dfa() -> 'Dfa':
+
+    d = Dfa(4, get_alphabet(), 0, 3)
+    d.add_transition(0, 0, '1')
+    d.add_transition(0, 1, '0')
+    d.add_transition(1, 1, '0')
+    d.add_transition(1, 2, '1')
+    d.add_transition(2, 0, '1')
+    d.add_transition(2, 3, '0')
+    d.add_transition(3, 3, '0')
+    d.add_transition(3, 3, '1')
+
+    return d
+
+
+class CountingExecutor(ThreadPoolExecutor):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+async def get_chunks(s: str, size: int):
+
+    for i in range(0, len(s), size):
+        yield s[i:i+size]
+
+
 class TestDfa(TestCase):
 
     def test_odd_length_dfa(self):
@@ -206,6 +243,224 @@ class TestNfa(TestCase):
         for i in range(1000):
             self.assertEqual(True, n.accepts(get_random_string()))
 
+    def test_sparse_transitions(self):
+
+        n: Nfa = Nfa(3, get_alphabet(), 0, 2)
+
+        n.add_transition(0, 0, '0')
+        n.add_transition(0, 0, '1')
+        n.add_transition(0, 1, '1')
+        n.add_transition(1, 2, None)
+
+        self.assertEqual({'0', '1'}, set(n.states[0].transitions))
+        self.assertEqual({}, n.states[2].transitions)
+        self.assertEqual([], n.states[2].get_transitions('0'))
+
+        t = n.get_sparse_transitions()
+
+        self.assertEqual(4, len(t))
+        self.assertEqual(4, len(t.offsets))
+        self.assertEqual([0], t.get_successors(0, '0'))
+        self.assertEqual([0, 1], t.get_successors(0, '1'))
+        self.assertEqual([2], t.get_successors(1, None))
+        self.assertEqual([], t.get_successors(1, '0'))
+        self.assertEqual([], t.get_successors(2, '1'))
+        self.assertRaises(ValueError, t.get_successors, 0, '2')
+        self.assertRaises(ValueError, t.get_successors, 3, '0')
+        self.assertRaises(ValueError, t.get_successors, -1, '0')
+
+        for i in range(1000):
+
+            s: str = get_random_string()
+            self.assertEqual(s[-1:] == '1', n.accepts(s))
+
+        n.states[2].add('0', n.states[2])
+        self.assertEqual([2], n.get_sparse_transitions().get_successors(2, '0'))
+        self.assertEqual(True, n.accepts('10'))
+
+
+class TestCompiledDfa(TestCase):
+
+    def test_substr_010(self):
+
+        d = get_substr_010_dfa()
+        match = compile_dfa(d)
+
+        for i in range(1000):
+
+            s: str = get_random_string()
+            self.assertEqual(d.accepts(s), match(s))
+
+        self.assertEqual(d.accepts(''), match(''))
+
+    def test_dead_state(self):
+
+        d = Dfa(3, get_alphabet(), 0, 1)
+        d.add_transition(0, 1, '1')
+        d.add_transition(0, 2, '0')
+        d.add_transition(1, 1, '0')
+        d.add_transition(1, 1, '1')
+        d.add_transition(2, 2, '0')
+        d.add_transition(2, 2, '1')
+
+        match = compile_dfa(d)
+
+        for i in range(1000):
+
+            s: str = get_random_string()
+            self.assertEqual(d.accepts(s), match(s))
+
+        self.assertRaises(ValueError, match, '0012')
+        self.assertRaises(ValueError, d.accepts, '0012')
+
+    def test_empty_dfa(self):
+
+        d = Dfa(1, get_alphabet(), 0)
+        d.add_transition(0, 0, '0')
+        d.add_transition(0, 0, '1')
+
+        match = compile_dfa(d)
+
+        self.assertEqual(False, match(get_random_string()))
+        self.assertEqual(False, match(''))
+        self.assertRaises(ValueError, match, '2')
+
+    def test_converted_nfa(self):
+
+        n: Nfa = Nfa(4, get_alphabet(), 0, 3)
+
+        n.add_transition(0, 0, '0')
+        n.add_transition(0, 0, '1')
+        n.add_transition(0, 1, '1')
+        n.add_transition(1, 2, '1')
+        n.add_transition(2, 3, '0')
+
+        d = n.convert_to_dfa()
+        match = compile_dfa(d)
+
+        for i in range(1000):
+
+            s: str = get_random_string()
+            self.assertEqual(s[-3:] == '110', match(s))
+
+        self.assertRaises(ValueError, compile_dfa, n)
+
+    def test_cache(self):
+
+        first = Dfa(2, get_alphabet(), 0, 1)
+        second = Dfa(2, get_alphabet(), 1, 0)
+
+        for d in (first, second):
+            d.add_transition(0, 1, '0')
+            d.add_transition(0, 1, '1')
+            d.add_transition(1, 0, '0')
+            d.add_transition(1, 0, '1')
+
+        self.assertIs(compile_dfa(first), compile_dfa(second))
+
+    def test_shared_nfa_alphabet(self):
+
+        al = get_alphabet()
+        Nfa(2, al, 0, 1)
+
+        d = Dfa(2, al, 0, 1)
+        d.add_transition(0, 1, '0')
+        d.add_transition(0, 1, '1')
+        d.add_transition(1, 0, '0')
+        d.add_transition(1, 0, '1')
+
+        match = compile_dfa(d)
+
+        for i in range(1000):
+
+            s: str = get_random_string()
+            self.assertEqual(d.accepts(s), match(s))
+
+    def test_undefined_transition(self):
+
+        d = Dfa(2, get_alphabet(), 0, 1)
+        d.add_transition(0, 1, '0')
+
+        self.assertRaises(ValueError, compile_dfa, d)
+
+
+class TestDfaStream(IsolatedAsyncioTestCase):
+
+    async def test_async_iterator(self):
+
+        d = get_substr_010_dfa()
+
+        for i in range(100):
+
+            s: str = get_random_string()
+            self.assertEqual(d.accepts(s), await accepts_stream(d, get_chunks(s, 7), chunk_size=3))
+
+        self.assertEqual(d.accepts(''), await accepts_stream(d, get_chunks('', 7)))
+
+    async def test_stream_reader(self):
+
+        d = get_substr_010_dfa()
+
+        for i in range(100):
+
+            s: str = get_random_string()
+
+            reader = asyncio.StreamReader()
+            reader.feed_data(s.encode())
+            reader.feed_eof()
+
+            self.assertEqual(d.accepts(s), await accepts_stream(d, reader, chunk_size=16))
+
+    async def test_offload(self):
+
+        d = get_substr_010_dfa()
+
+        with CountingExecutor(2) as executor:
+
+            for i in range(100):
+
+                s: str = get_random_string()
+                submitted: int = executor.submitted
+
+                result = await accepts_stream(d, get_chunks(s, 50), offload_size=50, executor=executor)
+
+                self.assertEqual(d.accepts(s), result)
+                self.assertEqual(len(s) // 50, executor.submitted - submitted)
+
+    async def test_concurrent_streams(self):
+
+        d = get_substr_010_dfa()
+        strings = [get_random_string() for _ in range(100)]
+
+        results = await asyncio.gather(*[accepts_stream(d, get_chunks(s, 10)) for s in strings])
+
+        self.assertEqual([d.accepts(s) for s in strings], results)
+
+    async def test_streams_interleave(self):
+
+        d = get_substr_010_dfa()
+        order: list = []
+
+        async def get_recorded_chunks(name: str):
+
+            async for chunk in get_chunks('01' * 10, 2):
+                order.append(name)
+                yield chunk
+
+        await asyncio.gather(accepts_stream(d, get_recorded_chunks('a')), accepts_stream(d, get_recorded_chunks('b')))
+
+        self.assertEqual(['a', 'b'] * 10, order)
+
+    async def test_invalid_input(self):
+
+        d = get_substr_010_dfa()
+
+        with self.assertRaises(ValueError):
+            await accepts_stream(d, get_chunks('0102', 2))
+
+        with self.assertRaises(ValueError):
+            await accepts_stream(Nfa(1, get_alphabet(), 0), get_chunks('01', 2))
+
 
 if __name__ == '__main__':
     main()